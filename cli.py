@@ -1,36 +1,116 @@
 # cli.py
 import typer
 from pathlib import Path
-from family import Family
-from payment import Payment
-from invitation import Invitation
-from typing import Dict, Set, List
-from matcher import match_families_with_payments
-from placecards import expand_areas_to_guests, write_guest_csv
-from seating_chart import create_area_aware_seating
-from seating_guide import build_seating_guide, write_seating_guide
-from seating_requests import extract_families_from_request, print_requests_map
-from write_seating_results import write_seating_results
-from table_sizes import get_num_families, get_num_guests, get_table_sizes, write_table_sizes
-import yaml
+from types import MappingProxyType
+from typing import FrozenSet, Mapping, Set, List, Tuple
+from functools import lru_cache
+from operator import attrgetter
+
+# Command modules (and yaml, phonenumbers, usaddress behind them) are imported
+# inside the commands that use them so `--help` and completion start fast.
 
 app = typer.Typer()
 
-def match_families():
-    package_root = Path(__file__).parent
-    guest_list_path = package_root / 'data' / 'guest-list.csv'
-    payment_path = package_root / 'data' / 'payment.csv'
+# Matching results are pickled here, keyed on the input CSVs' mtimes and sizes,
+# so re-running a command on unchanged data skips parsing and matching
+MATCH_CACHE_PATH = Path(__file__).parent / '.cache' / 'matched.pkl'
+# Part of the cache key: bump whenever Family/Payment parsing, Family.unique or
+# the matcher changes, so results cached by older code are not reused
+MATCH_CACHE_VERSION = 3
+NO_CACHE_OPTION = typer.Option(False, "--no-cache", help="Re-parse the CSVs instead of using the on-disk match cache")
+
+def _load_match_cache(key: Tuple):
+    """Return the cached match result for key, or None on a miss or unreadable cache"""
+    import pickle
+
+    try:
+        with open(MATCH_CACHE_PATH, 'rb') as f:
+            cached_key, result = pickle.load(f)
+    except Exception:
+        return None
+    return result if cached_key == key else None
+
+def _save_match_cache(key: Tuple, result: Tuple) -> None:
+    """Write the match result to the cache; an unwritable cache is skipped"""
+    import os
+    import pickle
+    import tempfile
+
+    try:
+        MATCH_CACHE_PATH.parent.mkdir(exist_ok=True)
+        # dump to a temp file and swap it in, so a failed or concurrent write
+        # never leaves a truncated cache behind
+        fd, tmp_path = tempfile.mkstemp(dir=MATCH_CACHE_PATH.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((key, result), f, protocol=5)
+            os.replace(tmp_path, MATCH_CACHE_PATH)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
+@lru_cache(maxsize=4)
+def _match_families_cached(guest_list_path: Path, payment_path: Path, guest_stamp: Tuple[float, int], pay_stamp: Tuple[float, int], use_disk_cache: bool = True) -> Tuple[FrozenSet, FrozenSet, FrozenSet, FrozenSet, Mapping]:
+    """
+    Match families to payments, trying the on-disk cache before parsing.
+    The (mtime, size) stamps are part of both cache keys so edited CSVs are re-read.
+    """
+    key = (MATCH_CACHE_VERSION, str(guest_list_path), str(payment_path), guest_stamp, pay_stamp)
+    result = _load_match_cache(key) if use_disk_cache else None
+    if result is None:
+        result = _match_families_uncached(guest_list_path, payment_path)
+        _save_match_cache(key, result)
+    matched_families = result[0]
+    return (*result, MappingProxyType({fam.email: fam for fam in matched_families}))
+
+def _match_families_uncached(guest_list_path: Path, payment_path: Path) -> Tuple[FrozenSet, FrozenSet, FrozenSet, FrozenSet]:
+    """Parse both CSVs and match families to payments."""
+    from family import Family
+    from payment import Payment
+    from matcher import match_families_with_payments
+
     families: Set = Family.from_csv(guest_list_path)
     # for family in families:
     #     print(family)
     unique_families: Set = Family.unique(families)
     payments: Set = Payment.from_csv(payment_path)
-    matched_families, matched_payments = match_families_with_payments(families=unique_families, payments=payments)
+    matched_families, matched_payments, unmatched_families, unmatched_payments = match_families_with_payments(families=unique_families, payments=payments)
+    # duplicates dropped by Family.unique are reported as unmatched too
+    unmatched_families |= families - unique_families
+    return (
+        frozenset(matched_families),
+        frozenset(matched_payments),
+        frozenset(unmatched_payments),
+        frozenset(unmatched_families),
+    )
+
+def _file_stamp(path: Path) -> Tuple[float, int]:
+    stat = path.stat()
+    return stat.st_mtime, stat.st_size
+
+def match_families(use_disk_cache: bool = True) -> Tuple[FrozenSet, Mapping]:
+    """
+    Match families to payments and write out the unmatched ones.
+    Returns the matched families and a read-only email -> family map of them.
+    """
+    from family import Family
+    from payment import Payment
+
+    package_root = Path(__file__).parent
+    guest_list_path = package_root / 'data' / 'guest-list.csv'
+    payment_path = package_root / 'data' / 'payment.csv'
+    matched_families, matched_payments, unmatched_payments, unmatched_families, email_map = _match_families_cached(
+        guest_list_path,
+        payment_path,
+        _file_stamp(guest_list_path),
+        _file_stamp(payment_path),
+        use_disk_cache,
+    )
     print("Matched:")
     print(f"  Payments: {len(matched_payments)}")
     print(f"  Families: {len(matched_families)}")
-    unmatched_payments = payments - matched_payments
-    unmatched_families = families - matched_families
     print("Unmatched:")
     print(f"  Payments: {len(unmatched_payments)}")
     print(f"  Families: {len(unmatched_families)}")
@@ -40,38 +120,43 @@ def match_families():
     # write out unmatched families
     families_file = Path.cwd() / 'unmatched_families.csv'
     Family.to_csv(list(unmatched_families), families_file)
-    return matched_families
+    return matched_families, email_map
 
 
 @app.command()
-def mail_invitations():
+def mail_invitations(no_cache: bool = NO_CACHE_OPTION):
     """
     Write three CSVs to working directory
     invitations.csv
     unmatched_payments.csv
     unmatched_families.csv
     """
+    from invitation import Invitation
+
     # write out invitations
-    matched_families = match_families()
-    invitations: List[Invitation] = Invitation.from_families(list(matched_families))
+    matched_families, _ = match_families(use_disk_cache=not no_cache)
+    # an invitation is addressed to the family's first guest, so sorting the
+    # families by last name lets the rows stream straight to the file
+    sorted_families: List = sorted(matched_families, key=attrgetter('last_name'))
     invitation_file = Path.cwd() / 'invitations.csv'
-    Invitation.to_csv(invitations, invitation_file)
+    Invitation.stream_to_csv(Invitation.iter_from_families(sorted_families), invitation_file)
 
 @app.command()
-def assign_tables():
+def assign_tables(no_cache: bool = NO_CACHE_OPTION):
     """
     Write a CSV of guests assigned to tables
     """
-    matched_families = match_families()
-    # sort by age
-    sorted_families: List = sorted(matched_families, key=lambda family: family.mean_daughter_age)
-    last_to_first: Dict = Family.last_to_firstnames(sorted_families)
-    last_to_family: Dict = Family.last_to_family(sorted_families)
+    from family import Family
+    from seating_chart import create_area_aware_seating
+    from seating_requests import build_requests_map, print_requests_map
+    from write_seating_results import write_seating_results
 
-    request_map = {}
-    for family in sorted_families:
-        requests = extract_families_from_request(request_string=family.requests, last_to_firstnames=last_to_first, last_to_families=last_to_family)
-        request_map[family] = requests
+    matched_families, _ = match_families(use_disk_cache=not no_cache)
+    # sort by age; email breaks ties so the order doesn't depend on how the set
+    # was built (a fresh match and one loaded from the cache iterate differently)
+    sorted_families: List = sorted(matched_families, key=attrgetter('mean_daughter_age', 'email'))
+    last_to_first, last_to_family = Family.last_name_indexes(sorted_families)
+    request_map = build_requests_map(sorted_families, last_to_first, last_to_family)
 
     print_requests_map(request_map)
 
@@ -85,6 +170,8 @@ def seating_guide():
     """
     Alphabetized list of last names to help guests know where to sit.
     """
+    from seating_guide import build_seating_guide, write_seating_guide
+
     areas_file = Path.cwd() / 'areas.yaml'
     guide_path = Path.cwd() / 'guide.yaml'
     guide = build_seating_guide(areas_file)
@@ -95,21 +182,26 @@ def table_sizes():
     """
     List of tables orders by how many are seated at them
     """
+    from table_sizes import get_num_families, get_num_guests, get_table_sizes, load_seating_yaml, write_table_sizes
+
     areas_file = Path.cwd() / 'areas.yaml'
     sizes_path = Path.cwd() / 'table_sizes.yaml'
-    sizes = get_table_sizes(areas_file)
-    num_guests = get_num_guests(areas_file)
-    num_families = get_num_families(areas_file)
+    areas = load_seating_yaml(areas_file)
+    sizes = get_table_sizes(areas)
+    num_guests = get_num_guests(areas)
+    num_families = get_num_families(areas)
     write_table_sizes(sizes, sizes_path, num_guests, num_families)
 
 @app.command()
-def placecards():
+def placecards(no_cache: bool = NO_CACHE_OPTION):
+    import yaml
+    from placecards import expand_areas_to_guests, write_guest_csv
+
     areas_file = Path.cwd() / 'areas.yaml'
     placecard_path = Path.cwd() / 'placecards.csv'
     with open(areas_file, "r") as f:
         areas = yaml.safe_load(f)
-    matched_families = match_families()
-    email_map = {fam.email: fam for fam in matched_families}
+    _, email_map = match_families(use_disk_cache=not no_cache)
     placecards = expand_areas_to_guests(areas, email_map)
     write_guest_csv(placecards, placecard_path)
 
@@ -1,17 +1,21 @@
 import csv
+import sys
 from dataclasses import dataclass, field
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Tuple
 from enum import Enum
 from datetime import datetime
 from collections import defaultdict
+from itertools import groupby
+from operator import attrgetter
 from statistics import mean
 
 from phone import normalize_phone
 from pathlib import Path
 
 Meal = Enum("Meal", ["Vegan", "Chicken", "Allergy", "Beef", "Kid-Friendly"])
+_MEAL_MAP = {meal.name: meal for meal in Meal}
 
-@dataclass
+@dataclass(slots=True)
 class Guest:
     first_name: str
     last_name: str
@@ -19,7 +23,7 @@ class Guest:
     allergies: str
     age: int
 
-@dataclass
+@dataclass(slots=True)
 class Family:
     email: str
     phone: str
@@ -28,6 +32,22 @@ class Family:
     submission: datetime
     part: int = 0  # used to distinquish fragments of an oversized family
     guests: List[Guest] = field(default_factory=list)
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Families are hashed constantly by the matcher and seating engine,
+        # and (email, part) never changes after construction
+        self._hash = hash((self.email, self.part))
+
+    def __getstate__(self):
+        # String hashes differ between processes, so _hash is not pickled
+        return (self.email, self.phone, self.address, self.requests,
+                self.submission, self.part, self.guests)
+
+    def __setstate__(self, state):
+        (self.email, self.phone, self.address, self.requests,
+         self.submission, self.part, self.guests) = state
+        self.__post_init__()
 
     @property
     def first_name(self):
@@ -60,7 +80,7 @@ class Family:
 
     def __hash__(self) -> int:
         # Identity is (email, part)
-        return hash((self.email, getattr(self, "part", 0)))
+        return self._hash
 
 
     def __eq__(self, other) -> bool:
@@ -84,67 +104,93 @@ class Family:
         """Deserialize a CSV file into a list of Families"""
         families = set()
         with open(filepath, newline="", encoding="utf-8-sig") as csvfile:
-            reader = csv.DictReader(csvfile)
+            reader = csv.reader(csvfile)
+            header = next(reader, [])
+            # Resolve column positions once per file; optional columns missing from
+            # the header point at a blank cell padded onto the end of every row
+            width = len(header)
+            idx = {name: i for i, name in enumerate(header)}
+            tickets_i = idx["Tickets"]
+            address_i = idx["Mailing Address"]
+            submission_i = idx["Submission time"]
+            email_i = idx.get("Email", width)
+            phone_i = idx.get("Phone", width)
+            requests_i = idx.get("Additional Requests:", width)
+            # The form has a fixed block of columns per ticket
+            max_tickets = sum(1 for name in header if name.startswith("First Name (Ticket "))
+            columns = [
+                (idx[first_col], *(idx.get(name, width) for name in others))
+                for first_col, *others in map(ticket_columns, range(1, max_tickets+1))
+            ]
             for row in reader:
+                if not row:
+                    continue  # blank line; DictReader skipped these too
+                row.extend([''] * (width + 1 - len(row)))
                 guests = []
-                num_tickets=int(row["Tickets"])                
-                for ticket in range(1, num_tickets+1):
-                    first_name = row[f"First Name (Ticket {ticket})"]
+                num_tickets=int(row[tickets_i])
+                for first_i, last_i, age_i, meal_i, allergies_i in columns[:num_tickets]:
+                    first_name = row[first_i]
                     if first_name:
                         guests.append(Guest(
                             first_name=first_name,
-                            last_name=row.get(f"Last Name (Ticket {ticket})", ''),
-                            age=int(row.get(f"Age (Ticket {ticket})") or 100),
-                            meal_choice=coerce_meal(row.get(f"Meal Choice (Ticket {ticket})", "Chicken")),
-                            allergies=row.get(f"List Allergies (Ticket {ticket}):", '')
+                            last_name=row[last_i],
+                            age=coerce_age(row[age_i]),
+                            meal_choice=coerce_meal(row[meal_i]),
+                            allergies=row[allergies_i]
                         ))
                 if num_tickets > 0:
                     families.add(cls(
-                        email=row.get("Email", '').lower(),
-                        phone=normalize_phone(row.get("Phone",'')),
+                        email=sys.intern(row[email_i].strip().lower()),
+                        phone=normalize_phone(row[phone_i]),
                         guests=guests,
-                        address=row["Mailing Address"],
-                        requests=row.get("Additional Requests:", ""),
-                        submission=datetime.fromisoformat(row["Submission time"])
+                        address=row[address_i],
+                        requests=row[requests_i],
+                        submission=datetime.fromisoformat(row[submission_i])
 
                     ))
         return families
 
     @staticmethod
     def unique(families: Set["Family"]) -> Set["Family"]:
+        # A family is a duplicate if EITHER its phone or its address was seen,
+        # so the two keys need separate sets rather than one (phone, address) key
         seen_phones = set()
         seen_addresses = set()
         unique_families = set()
         for family in families:
-            if family.phone in seen_phones or family.address in seen_addresses:
+            phone = family.phone
+            address = family.address
+            if phone in seen_phones or address in seen_addresses:
                 continue  # skip duplicate
+            seen_phones.add(phone)
+            seen_addresses.add(address)
             unique_families.add(family)
-            seen_phones.add(family.phone)
-            seen_addresses.add(family.address)
         return unique_families
 
 
 
     @staticmethod
     def to_csv(families: List["Family"], filepath: Path) -> None:
-        """Serialize a list of Family objects into a CSV file."""
-        sorted_families = sorted(families, key=lambda f: f.oldest_guest().last_name)
+        """Serialize a list of Family objects into a CSV file. Sorts the list in place by last name."""
+        # last_name is the oldest guest's last name
+        families.sort(key=attrgetter("last_name"))
         with open(filepath, mode="w", newline="", encoding="utf-8") as csvfile:
             writer = csv.DictWriter(
                 csvfile,
                 fieldnames=["Last Name", "First Name", "Email", "Phone", "Tickets", "Address"]
             )
             writer.writeheader()
-            for fam in sorted_families:
-                adult=fam.oldest_guest()
-                writer.writerow({
+            writer.writerows(
+                {
                     "Email": fam.email,
                     "Phone": fam.phone,
-                    "First Name": adult.first_name,
+                    "First Name": (adult := fam.oldest_guest()).first_name,
                     "Last Name": adult.last_name,
                     "Address": fam.address,
                     "Tickets": len(fam.guests)
-                })
+                }
+                for fam in families
+            )
 
     @staticmethod
     def last_to_firstnames(families: List["Family"]) -> Dict:
@@ -162,9 +208,33 @@ class Family:
             last_to_family[family.last_name].append(family)
         return last_to_family
 
+    @staticmethod
+    def last_name_indexes(families: List["Family"]) -> Tuple[Dict, Dict]:
+        """Build last_to_firstnames and last_to_family in a single pass, keyed in last-name order"""
+        last_to_first = {}
+        last_to_family = {}
+        by_last_name = sorted(families, key=attrgetter("last_name"))
+        for last_name, group in groupby(by_last_name, key=attrgetter("last_name")):
+            group = list(group)
+            last_to_family[last_name] = group
+            last_to_first[last_name] = [family.first_name for family in group]
+        return last_to_first, last_to_family
+
+def ticket_columns(ticket: int) -> Tuple[str, str, str, str, str]:
+    """Return the guest-list column names for a ticket number"""
+    return (
+        f"First Name (Ticket {ticket})",
+        f"Last Name (Ticket {ticket})",
+        f"Age (Ticket {ticket})",
+        f"Meal Choice (Ticket {ticket})",
+        f"List Allergies (Ticket {ticket}):",
+    )
+
+def coerce_age(value: str) -> int:
+    # a blank age is treated as an adult
+    return int(value) if value else 100
+
 def coerce_meal(value: str) -> Meal:
-    try:
-        return Meal[value]  # lookup by name
-    except KeyError:
-        return Meal.Chicken
+    # lookup by name, blank/unknown meals default to Chicken
+    return _MEAL_MAP.get(value, Meal.Chicken)
 
@@ -1,5 +1,11 @@
 from family import Family, Guest, Meal
-from datetime import datetime
+from datetime import datetime, timedelta
+from itertools import count
+
+# Each family gets a later submission time than the one made before it, so
+# sorting by submission reproduces creation order
+_SUBMISSION_START = datetime.now()
+_submission_order = count()
 # ---------------------------------------------------------
 # Helper: minimal Family factory for testing
 # ---------------------------------------------------------
@@ -15,18 +21,15 @@ def make_family(first: str, last: str, size: int = 1, requests: str = '') -> Fam
 
     All other fields can be safely filled with defaults.
     """
-    guest = make_guest(first, last)
-    guests = []
-    # Add placeholder guests to match requested size
-    for _ in range(size):
-        guests.append(guest)
+    # Placeholder guests to match requested size (all the same Guest object)
+    guests = [make_guest(first, last)] * size
 
     return Family(
         email=f"{first}.{last}@example.com",
         phone=f"{first}.{last}",
         address=f"{first}.{last}",
         requests=requests,            # raw request string not used by seating_chart
-        submission=datetime.now(),
+        submission=_SUBMISSION_START + timedelta(microseconds=next(_submission_order)),
         guests=guests,
     )
 
@@ -1,10 +1,31 @@
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from family import Family
-from typing import List
+from typing import Iterable, Iterator, List, Tuple
 import csv
+import re
+from operator import attrgetter
 from pathlib import Path
 import usaddress
 
+_STREET_TYPES = (
+    "St|Street|Ave|Avenue|Rd|Road|Blvd|Boulevard|Dr|Drive|Ln|Lane|Ct|Court|Way|"
+    "Pl|Place|Cir|Circle|Pkwy|Parkway|Trl|Trail|Ter|Terrace"
+)
+# words that usaddress labels as something other than street/place name
+_NOT_NAME = (
+    rf"(?:{_STREET_TYPES}|N|S|E|W|NE|NW|SE|SW|North|South|East|West|Northeast|Northwest|"
+    r"Southeast|Southwest|Unit|Apt|Suite|Ste|Lot|Bldg|Fl|Rm|Spc|Trlr|Ft|Fort|Mt|Po|Box)\b"
+)
+# Plain "123 Some Name Dr City Name, ST 12345 US" addresses; anything else goes to usaddress
+_SIMPLE_ADDRESS_RE = re.compile(
+    rf"^(?P<AddressNumber>\d+) "
+    rf"(?P<StreetName>(?:(?!{_NOT_NAME})[A-Za-z]+ )+?)"
+    rf"(?P<StreetNamePostType>(?:{_STREET_TYPES})\.?) "
+    rf"(?P<PlaceName>(?:(?!{_NOT_NAME})[A-Za-z]+ )*?(?!{_NOT_NAME})[A-Za-z]+) ?, "
+    rf"(?P<StateName>[A-Z]{{2}}) (?P<ZipCode>\d{{5}}(?:-\d{{4}})?)(?: US)?$",
+    re.IGNORECASE,
+)
+
 @dataclass
 class Invitation:
     last_name: str
@@ -16,48 +37,65 @@ class Invitation:
 
     @classmethod
     def from_families(cls, families: List[Family]):
-        invitations = []
+        return list(cls.iter_from_families(families))
+
+    @classmethod
+    def iter_from_families(cls, families: Iterable[Family]) -> Iterator["Invitation"]:
+        """Yield one Invitation per family, in the order given"""
         for family in families:
-            adult = family.guests[0]
-            parsed_address: dict[str, str] = {}
-            address_type: str = ""
-            try:
-                parsed_address, address_type = usaddress.tag(family.address)
-            except usaddress.RepeatedLabelError :
-                print(f'Bad address: {family.address}')
-            if address_type == 'PO Box':
-                box = parsed_address.get('USPSBoxID','')
-                address1 = f'P.O. Box {box}'.strip()
-            else:
-                addr_num = parsed_address.get('AddressNumber','')
-                street_name=parsed_address.get('StreetName','').title().strip()
-                street_type=parsed_address.get('StreetNamePostType','').title()
-                address1 = f'{addr_num} {street_name} {street_type}'.strip()
-            
-            city=parsed_address.get('PlaceName','').title()
-            state=parsed_address.get('StateName','')
-            zip_code=parsed_address.get('ZipCode','')
-            address2 = f'{city}, {state} {zip_code}'.strip()
-            invitations.append(
-                Invitation(
-                    first_name=adult.first_name,
-                    last_name=adult.last_name,
-                    num_tickets=len(family.guests),
-                    address1=address1,
-                    address2=address2
-                )
+            adult = family.oldest_guest()
+            address1, address2 = address_lines(family.address)
+            yield cls(
+                first_name=adult.first_name,
+                last_name=adult.last_name,
+                num_tickets=len(family.guests),
+                address1=address1,
+                address2=address2
             )
-        return invitations
 
     @staticmethod
     def to_csv(invitations: List["Invitation"], filepath: Path) -> None:
         """Write a list of Invitations to a CSV file, sorted by last name."""
-        sorted_invitations = sorted(invitations, key=lambda i: i.last_name)
-        with open(filepath, mode="w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.DictWriter(
-                csvfile,
-                fieldnames=asdict(sorted_invitations[0]).keys()
-            )
-            writer.writeheader()
-            for inv in sorted_invitations:
-                writer.writerow(asdict(inv))
+        sorted_invitations = sorted(invitations, key=attrgetter("last_name"))
+        Invitation.stream_to_csv(sorted_invitations, filepath)
+
+    @staticmethod
+    def stream_to_csv(invitations: Iterable["Invitation"], filepath: Path) -> None:
+        """Write Invitations to a CSV file in the order given, without holding them all in memory."""
+        with open(filepath, mode="w", newline="", encoding="utf-8", buffering=1 << 20) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(_INV_FIELDS)
+            writer.writerows(map(_inv_row, invitations))
+
+
+# CSV columns, in dataclass field order
+_INV_FIELDS = tuple(f.name for f in fields(Invitation))
+_inv_row = attrgetter(*_INV_FIELDS)
+
+
+def address_lines(address: str) -> Tuple[str, str]:
+    """Split a free-form mailing address into (street line, city/state/zip line)"""
+    parsed_address: dict[str, str] = {}
+    address_type: str = ""
+    match = _SIMPLE_ADDRESS_RE.match(address)
+    if match:
+        parsed_address = match.groupdict()
+    else:
+        try:
+            parsed_address, address_type = usaddress.tag(address)
+        except usaddress.RepeatedLabelError :
+            print(f'Bad address: {address}')
+    if address_type == 'PO Box':
+        box = parsed_address.get('USPSBoxID','')
+        address1 = f'P.O. Box {box}'.strip()
+    else:
+        addr_num = parsed_address.get('AddressNumber','')
+        street_name=parsed_address.get('StreetName','').title().strip()
+        street_type=parsed_address.get('StreetNamePostType','').title()
+        address1 = f'{addr_num} {street_name} {street_type}'.strip()
+
+    city=parsed_address.get('PlaceName','').title()
+    state=parsed_address.get('StateName','')
+    zip_code=parsed_address.get('ZipCode','')
+    address2 = f'{city}, {state} {zip_code}'.strip()
+    return address1, address2
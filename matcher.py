@@ -1,18 +1,55 @@
 from family import Family
 from payment import Payment
 from typing import Set, Tuple
+from collections import defaultdict
 
-def match_families_with_payments(families: Set[Family], payments: Set[Payment]) -> Tuple[Set[Family], Set[Payment]]:
-    matched_families = families_with_payment(families, payments)
-    matched_payments = get_matched_payments(matched_families, payments)
-    return matched_families, matched_payments
+def match_families_with_payments(families: Set[Family], payments: Set[Payment]) -> Tuple[Set[Family], Set[Payment], Set[Family], Set[Payment]]:
+    """
+    Split families and payments into matched and unmatched sets.
+    A family and a payment match when they share a non-blank email or phone.
+    Returns (matched_families, matched_payments, unmatched_families, unmatched_payments)
+    """
+    # Index the larger side and loop over the smaller one
+    if len(payments) < len(families):
+        matched_payments, unmatched_payments, matched_families, unmatched_families = _match_against_index(payments, families)
+    else:
+        matched_families, unmatched_families, matched_payments, unmatched_payments = _match_against_index(families, payments)
+    return matched_families, matched_payments, unmatched_families, unmatched_payments
+
+def _match_against_index(probes, indexed) -> Tuple[set, set, set, set]:
+    # One pass builds email/phone -> records for `indexed`, one pass probes it.
+    # Returns (matched_probes, unmatched_probes, matched_indexed, unmatched_indexed)
+    by_email = defaultdict(list)
+    by_phone = defaultdict(list)
+    for record in indexed:
+        if record.email:
+            by_email[record.email].append(record)
+        if record.phone:
+            by_phone[record.phone].append(record)
+
+    matched_probes, unmatched_probes = set(), set()
+    matched_indexed = set()
+    for probe in probes:
+        email_hits = by_email.get(probe.email)
+        phone_hits = by_phone.get(probe.phone)
+        if not (email_hits or phone_hits):
+            unmatched_probes.add(probe)
+            continue
+        matched_probes.add(probe)
+        if email_hits:
+            matched_indexed.update(email_hits)
+        if phone_hits:
+            matched_indexed.update(phone_hits)
+
+    unmatched_indexed = {record for record in indexed if record not in matched_indexed}
+    return matched_probes, unmatched_probes, matched_indexed, unmatched_indexed
 
 
 def families_with_payment(families: Set[Family], payments: Set[Payment]) -> Set[Family]:
-    # Union of both sets
-    email = families_with_payment_email(families, payments) 
-    phone = families_with_payment_phone(families, payments)
-    return email | phone
+    # Union of the email and phone matches, in one pass over families
+    payment_emails = {p.email for p in payments if p.email}
+    payment_phones = {p.phone for p in payments if p.phone}
+    return {f for f in families if f.email in payment_emails or f.phone in payment_phones}
 
 def families_with_payment_email(families: Set[Family], payments: Set[Payment]) -> Set[Family]:
     payment_emails = {p.email for p in payments if p.email}
@@ -1,5 +1,8 @@
 import csv
-from dataclasses import asdict, dataclass
+import io
+import sys
+from dataclasses import dataclass, fields
+from operator import attrgetter
 from typing import Set, List
 from phone import normalize_phone
 from pathlib import Path
@@ -13,24 +16,53 @@ class Payment:
     phone: str
     order_number: str
 
+    def __post_init__(self):
+        # Cached as a plain attribute, not a field, so the CSV columns
+        # built from fields() are unaffected
+        self._hash = hash(self.order_number)
+
+    def __getstate__(self):
+        # String hashes differ between processes, so _hash is not pickled
+        state = self.__dict__.copy()
+        del state["_hash"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__post_init__()
+
     @classmethod
     def from_csv(cls, filepath) -> Set["Payment"]:
         """Deserialize a CSV file into a list of Payment objects."""
         payments = set()
-        with open(filepath, newline="", encoding="utf-16") as csvfile:
-            reader = csv.DictReader(csvfile, delimiter="\t")
+        with open(filepath, "rb", buffering=1 << 20) as raw, \
+                io.TextIOWrapper(raw, encoding="utf-16", newline="") as csvfile:
+            reader = csv.reader(csvfile, delimiter="\t")
+            header = next(reader, [])
+            # Resolve column positions once per file. The export repeats some
+            # headers; like DictReader, the last column with a name wins.
+            width = len(header)
+            idx = {name: i for i, name in enumerate(header)}
+            order_i = idx["Order number"]
+            first_i = idx["Guest first name"]
+            last_i = idx["Guest last name"]
+            email_i = idx["Email"]
+            phone_i = idx.get("Phone Number", width)  # missing column reads as blank
             for row in reader:
+                if not row:
+                    continue  # blank line; DictReader skipped these too
+                row.extend([''] * (width + 1 - len(row)))
                 payments.add(cls(
-                    order_number=row["Order number"],
-                    first_name=row["Guest first name"],
-                    last_name=row["Guest last name"],
-                    email=row["Email"].lower(),
-                    phone=normalize_phone(row.get("Phone Number",'')),
+                    order_number=sys.intern(row[order_i]),
+                    first_name=row[first_i],
+                    last_name=row[last_i],
+                    email=sys.intern(row[email_i].strip().lower()),
+                    phone=normalize_phone(row[phone_i]),
                 ))
         return payments
 
     def __hash__(self):
-        return hash(self.order_number)
+        return self._hash
 
     def __eq__(self, other):
         if not isinstance(other, Payment):
@@ -50,8 +82,9 @@ class Payment:
         if not payments:
             return  # Nothing to write
 
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=asdict(payments[0]).keys())
-            writer.writeheader()
-            for payment in payments:
-                writer.writerow(asdict(payment))
+        fieldnames = [f.name for f in fields(Payment)]
+        row = attrgetter(*fieldnames)
+        with open(filename, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(fieldnames)
+            writer.writerows(map(row, payments))
@@ -1,6 +1,15 @@
+from functools import lru_cache
+
 import phonenumbers
 
 def normalize_phone(phone: str, region: str = "US") -> str:
+    if not phone:
+        return ''
+    return _normalize_phone(phone, region)
+
+@lru_cache(maxsize=4096)
+def _normalize_phone(phone: str, region: str) -> str:
+    # parsing is the slow part, and the same number shows up across rows and files
     try:
         parsed = phonenumbers.parse(phone, region)
         if phonenumbers.is_valid_number(parsed):
@@ -9,4 +18,3 @@ def normalize_phone(phone: str, region: str = "US") -> str:
         return ''
     except phonenumbers.NumberParseException:
         return ''
-
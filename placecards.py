@@ -24,30 +24,32 @@ def expand_areas_to_guests(
     based on the 'size' attribute.
     """
     result: Dict[str, List["Guest"]] = defaultdict(list)
+    lookup = email_lookup.get
+    default_meal = Meal.Chicken  # or your default
 
     for tables in areas.values():
         for raw_table_name, family_dicts in tables.items():
-            table_name = str(raw_table_name)
+            if not family_dicts:
+                continue
+            table_guests = result[str(raw_table_name)]
             for fam_dict in family_dicts:
                 email = fam_dict["email"]
-                size = fam_dict["size"]
+                family = lookup(email)
 
-                if email in email_lookup:
-                    family = email_lookup[email]
-                    result[table_name].extend(family.guests)
+                if family is not None:
+                    table_guests.extend(family.guests)
                 else:
                     # Create placeholder guests
-                    placeholder_guests = [
+                    table_guests.extend(
                         Guest(
                             first_name=f"Guest{i+1}",
                             last_name=f"{email}",
-                            meal_choice=Meal.Chicken,  # or your default
+                            meal_choice=default_meal,
                             allergies="",
                             age=0,
                         )
-                        for i in range(size)
-                    ]
-                    result[table_name].extend(placeholder_guests)
+                        for i in range(fam_dict["size"])
+                    )
 
     return dict(result)
 
@@ -67,20 +69,25 @@ def write_guest_csv(table_to_guests: Dict[str, List["Guest"]], output_path: Path
         "age",
     ]
 
-    with output_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
+    # sorted() evaluates table_sort_key once per table and compares the
+    # resulting tuples in C, so there's no need to decorate by hand
+    ordered_tables = sorted(table_to_guests, key=table_sort_key)
 
-        for table_name in sorted(table_to_guests.keys(), key=table_sort_key):
-            for guest in table_to_guests[table_name]:
-                writer.writerow({
-                    "table": table_name,
-                    "first_name": guest.first_name,
-                    "last_name": guest.last_name,
-                    "meal_choice": guest.meal_choice.name,  # or .value
-                    "allergies": guest.allergies,
-                    "age": guest.age,
-                })
+    with output_path.open("w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows(
+            (
+                table_name,
+                guest.first_name,
+                guest.last_name,
+                guest.meal_choice.name,  # or .value
+                guest.allergies,
+                guest.age,
+            )
+            for table_name in ordered_tables
+            for guest in table_to_guests[table_name]
+        )
 
 def table_sort_key(name: str):
     """
@@ -19,12 +19,15 @@ Architecture:
 
 from __future__ import annotations
 
-from collections import defaultdict, deque
-from typing import Dict, List, Tuple, DefaultDict
+from collections import Counter
+from typing import Dict, Iterator, List, Tuple
+import logging
 import math
-from math import ceil
+from operator import attrgetter
+from functools import lru_cache
 from family import Family
 
+log = logging.getLogger(__name__)
 
 # You have a concrete Family class elsewhere; we just rely on its interface:
 # - first_name: str
@@ -48,35 +51,53 @@ def build_clusters(
         - Nodes are Family objects
         - Edges exist if A requests B or B requests A
     """
-    graph: DefaultDict["Family", set["Family"]] = defaultdict(set)
+    # Union-find over family positions; requested families missing from
+    # `families` still join their requester's cluster, after it in order
+    index: Dict["Family", int] = {}
+    nodes: List["Family"] = []
+    parent: List[int] = []
+    weight: List[int] = []
+
+    def add(fam: "Family") -> int:
+        i = index.get(fam)
+        if i is None:
+            i = index[fam] = len(nodes)
+            nodes.append(fam)
+            parent.append(i)
+            weight.append(1)
+        return i
+
+    def find(i: int) -> int:
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        # path compression
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    def union(a: int, b: int) -> None:
+        a, b = find(a), find(b)
+        if a == b:
+            return
+        # attach the lighter tree under the heavier one
+        if weight[a] < weight[b]:
+            a, b = b, a
+        parent[b] = a
+        weight[a] += weight[b]
 
-    # Build undirected edges
     for fam in families:
-        for other in requests_map.get(fam, []):
-            graph[fam].add(other)
-            graph[other].add(fam)
-
-    visited: set["Family"] = set()
-    clusters: List[List["Family"]] = []
-
-    # BFS to find connected components
+        add(fam)
     for fam in families:
-        if fam in visited:
-            continue
-
-        queue: deque["Family"] = deque([fam])
-        visited.add(fam)
-        cluster: List["Family"] = [fam]
-
-        while queue:
-            cur = queue.popleft()
-            for neighbor in graph[cur]:
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append(neighbor)
-                    cluster.append(neighbor)
+        i = index[fam]
+        for other in requests_map.get(fam, ()):
+            union(i, add(other))
 
-        clusters.append(cluster)
+    # Clusters come out ordered by their first family, members in input order
+    groups: Dict[int, List["Family"]] = {}
+    for i, fam in enumerate(nodes):
+        groups.setdefault(find(i), []).append(fam)
+    clusters: List[List["Family"]] = list(groups.values())
 
     return clusters
 
@@ -90,7 +111,9 @@ def assign_cluster_to_area(
     areas: dict[int, list[list["Family"]]],
     area_used: dict[int, int],
     table_size: int,
-    debug: bool = True,
+    debug: bool = False,
+    cluster_size: int | None = None,
+    tables_used: list[list[int]] | None = None,
 ) -> int:
     """
     Decide which area a cluster should be placed into.
@@ -104,16 +127,23 @@ def assign_cluster_to_area(
         If no existing area has a table that can hold the cluster, we must
         create a NEW area.
 
+    cluster_size and tables_used (seats used per table, indexed by area) may be
+    passed in when the caller already tracks them; otherwise they are
+    recomputed from the families.
+
     Returns:
         area_index (int)
     """
 
-    cluster_size = sum(f.size for f in cluster)
+    if cluster_size is None:
+        cluster_size = sum(f.size for f in cluster)
 
+    # debug=True emits log records; they show up once DEBUG is enabled for this module
+    debug = debug and log.isEnabledFor(logging.DEBUG)
     if debug:
-        print(
-            f"\n=== Deciding area for cluster {[f.last_name for f in cluster]} "
-            f"(size {cluster_size}) ==="
+        log.debug(
+            "Deciding area for cluster %s (size %d)",
+            [f.last_name for f in cluster], cluster_size,
         )
 
     best_area: int | None = None
@@ -124,30 +154,31 @@ def assign_cluster_to_area(
     # ------------------------------------------------------------
     for area_idx, tables in areas.items():
 
-        # Find the maximum remaining seats in ANY table in this area
-        table_remaining = [
-            table_size - sum(f.size for f in table)
-            for table in tables
-        ]
+        if tables_used is not None:
+            used = tables_used[area_idx]
+        else:
+            used = [sum(f.size for f in table) for table in tables]
 
         # If area has no tables yet, it cannot accept the cluster
-        if not table_remaining:
+        if not used:
             if debug:
-                print(f"  Area {area_idx}: no tables → cannot accept cluster")
+                log.debug("  Area %d: no tables → cannot accept cluster", area_idx)
             continue
 
-        max_remaining = max(table_remaining)
+        # Find the maximum remaining seats in ANY table in this area
+        max_remaining = table_size - min(used)
 
         if debug:
-            print(
-                f"  Area {area_idx}: table_remaining={table_remaining}, "
-                f"max_remaining={max_remaining}"
+            log.debug(
+                "  Area %d: table_remaining=%s, max_remaining=%d",
+                area_idx, [table_size - u for u in used], max_remaining,
             )
 
         # Can this area accept the cluster?
         if max_remaining >= cluster_size:
-            # Prefer the area whose best table has the MOST remaining space
-            if best_area is None or max_remaining > best_remaining:
+            # Best fit: prefer the area whose best table has the LEAST
+            # remaining space that still holds the cluster
+            if best_area is None or max_remaining < best_remaining:
                 best_area = area_idx
                 best_remaining = max_remaining
 
@@ -157,11 +188,11 @@ def assign_cluster_to_area(
     if best_area is None:
         new_area_idx = len(areas)
         if debug:
-            print(f"→ Choosing NEW Area {new_area_idx} (no existing area fits)")
+            log.debug("→ Choosing NEW Area %d (no existing area fits)", new_area_idx)
         return new_area_idx
     # Otherwise, use the best existing area
     if debug:
-        print(f"→ Choosing EXISTING Area {best_area} (fits in one table)")
+        log.debug("→ Choosing EXISTING Area %d (fits in one table)", best_area)
     return best_area
 
 
@@ -174,66 +205,74 @@ def place_cluster_into_area(
     area_tables: list[list["Family"]],
     table_size: int,
     requests_map: dict["Family", list["Family"]],
-    debug: bool = True,
+    debug: bool = False,
+    table_used: list[int] | None = None,
+    table_of: dict["Family", int] | None = None,
 ) -> None:
     """
     place all families in a (possibly split) cluster into tables.
 
     since oversized families have already been split into table-sized chunks,
     this function becomes a pure bin-packing routine with adjacency scoring.
+
+    table_used (seats used per table) and table_of (family -> table index),
+    if given, describe area_tables and are updated in place.
     """
+    debug = debug and log.isEnabledFor(logging.DEBUG)
     if debug:
-        print(f"  placing cluster of {len(cluster)} families")
+        log.debug("  placing cluster of %d families", len(cluster))
 
-    # track used seats per table
-    table_used = [sum(f.size for f in table) for table in area_tables]
+    # track used seats per table, and which table each seated family is at
+    if table_used is None:
+        table_used = [sum(f.size for f in table) for table in area_tables]
+    if table_of is None:
+        table_of = {f: i for i, table in enumerate(area_tables) for f in table}
 
-    for fam in cluster:
+    # largest families first (first-fit decreasing); ties keep cluster order
+    for fam in sorted(cluster, key=attrgetter("size"), reverse=True):
         if debug:
-            print(f"    placing {fam.last_name} (size {fam.size}, part={fam.part})")
-
-        requested = set(requests_map.get(fam, []))
+            log.debug("    placing %s (size %d, part=%d)", fam.last_name, fam.size, fam.part)
 
+        size = fam.size
         best_table = None
-        best_score = -1
-
-        # try to place near requested families
-        for i, table in enumerate(area_tables):
-            remaining = table_size - table_used[i]
-            if remaining < fam.size:
-                continue
-
-            score = sum(1 for other in table if other in requested)
-
-            if score > best_score:
-                best_score = score
-                best_table = i
+        best_score = 0
+
+        # try to place near requested families: only tables that already
+        # seat one of them can score, so count those instead of scanning all
+        requested = requests_map.get(fam)
+        if requested:
+            scores = Counter(table_of[r] for r in set(requested) if r in table_of)
+            for i, score in scores.items():
+                if table_used[i] + size > table_size:
+                    continue
+                # highest score wins, ties go to the earliest table
+                if score > best_score or (score == best_score and i < best_table):
+                    best_table = i
+                    best_score = score
 
         if best_table is not None:
             if debug:
-                print(f"      → placed at table {best_table} (score {best_score})")
-            area_tables[best_table].append(fam)
-            table_used[best_table] += fam.size
-            continue
+                log.debug("      → placed at table %d (score %d)", best_table, best_score)
+        else:
+            # otherwise place in first table with space
+            for i, used in enumerate(table_used):
+                if used + size <= table_size:
+                    if debug:
+                        log.debug("      → placed at table %d (first fit)", i)
+                    best_table = i
+                    break
 
-        # otherwise place in first table with space
-        placed = False
-        for i, used in enumerate(table_used):
-            if used + fam.size <= table_size:
-                if debug:
-                    print(f"      → placed at table {i} (first fit)")
-                area_tables[i].append(fam)
-                table_used[i] += fam.size
-                placed = True
-                break
-
-        # if no table fits, create a new one
-        if not placed:
-            new_idx = len(area_tables)
+        if best_table is not None:
+            area_tables[best_table].append(fam)
+            table_used[best_table] += size
+        else:
+            # if no table fits, create a new one
+            best_table = len(area_tables)
             if debug:
-                print(f"      → created new table {new_idx}")
+                log.debug("      → created new table %d", best_table)
             area_tables.append([fam])
-            table_used.append(fam.size)
+            table_used.append(size)
+        table_of[fam] = best_table
 
 # split families bigger than tables into multiple families in the same cluster of requests
 def split_oversized_families(
@@ -263,13 +302,7 @@ def split_oversized_families(
             continue
 
         # Oversized family → split into parts
-        parts_needed = ceil(fam.size / table_size)
-        remaining = fam.size
-
-        for part_idx in range(parts_needed):
-            part_size = min(table_size, remaining)
-            remaining -= part_size
-
+        for part_idx, part_size in enumerate(_split_sizes(fam.size, table_size)):
             # Create a new Family object with part index
             fam_part = Family(
                 email=fam.email,
@@ -288,41 +321,59 @@ def split_oversized_families(
 
     return new_cluster
 
+@lru_cache(maxsize=None)
+def _split_sizes(size: int, table_size: int) -> Tuple[int, ...]:
+    # full tables first, then whatever is left; families repeat the same few sizes
+    full, rest = divmod(size, table_size)
+    return (table_size,) * full + ((rest,) if rest else ())
+
 # =========================================================
 # 4. CONFLICT REPORT
 # =========================================================
 
+_UNSEATED = (None, None)  # location of a requester that has no seat
+
 def generate_conflict_report(
     areas: Dict[int, List[List["Family"]]],
     requests_map: Dict["Family", List["Family"]],
+    location: Dict["Family", Tuple[int, int]] | None = None,
 ) -> List[Tuple["Family", "Family", str]]:
     """
     Generate a list of unmet seating requests.
 
     A request is satisfied if the requested family is seated in the same AREA.
+    Pass location (family → (area, table)) if the caller already tracks it.
     """
-    conflicts: List[Tuple["Family", "Family", str]] = []
+    return list(iter_conflicts(areas, requests_map, location))
 
+
+def iter_conflicts(
+    areas: Dict[int, List[List["Family"]]],
+    requests_map: Dict["Family", List["Family"]],
+    location: Dict["Family", Tuple[int, int]] | None = None,
+) -> Iterator[Tuple["Family", "Family", str]]:
+    """Yield unmet seating requests one at a time, as generate_conflict_report lists them"""
     # Build lookup: family → (area, table)
-    location: Dict["Family", Tuple[int, int]] = {}
-    for area_idx, tables in areas.items():
-        for table_idx, table in enumerate(tables):
-            for fam in table:
-                location[fam] = (area_idx, table_idx)
+    if location is None:
+        location = {
+            fam: (area_idx, table_idx)
+            for area_idx, tables in areas.items()
+            for table_idx, table in enumerate(tables)
+            for fam in table
+        }
+    location_get = location.get
 
     for fam, reqs in requests_map.items():
-        fam_area = location.get(fam, (None, None))[0]
+        fam_area = location_get(fam, _UNSEATED)[0]
 
         for other in reqs:
-            if other not in location:
-                conflicts.append((fam, other, "Requested family not found"))
+            other_location = location_get(other)
+            if other_location is None:
+                yield (fam, other, "Requested family not found")
                 continue
 
-            other_area = location[other][0]
-            if other_area != fam_area:
-                conflicts.append((fam, other, "Not seated in same area"))
-
-    return conflicts
+            if other_location[0] != fam_area:
+                yield (fam, other, "Not seated in same area")
 
 
 # =========================================================
@@ -346,20 +397,19 @@ def visualize_areas(areas: Dict[int, List[List["Family"]]]) -> str:
 
 def visualize_clusters(clusters: list[list["Family"]]) -> None:
     """
-    Pretty-print clusters when debug mode is enabled.
+    Log clusters at debug level.
     Each cluster is shown with its families, including part numbers.
     """
-    print("\n=== CLUSTERS ===")
+    log.debug("=== CLUSTERS ===")
     for idx, cluster in enumerate(clusters):
-        print(f"Cluster {idx} ({len(cluster)} families):")
+        log.debug("Cluster %d (%d families):", idx, len(cluster))
         for fam in cluster:
             part = getattr(fam, "part", 0)
             if part:
-                print(f"  - {fam.first_name} {fam.last_name} (size={fam.size}, part={part})")
+                log.debug("  - %s %s (size=%d, part=%d)", fam.first_name, fam.last_name, fam.size, part)
             else:
-                print(f"  - {fam.first_name} {fam.last_name} (size={fam.size})")
-        print()
-    print("================\n")
+                log.debug("  - %s %s (size=%d)", fam.first_name, fam.last_name, fam.size)
+    log.debug("================")
 
 
 
@@ -371,7 +421,7 @@ def create_area_aware_seating(
     families_sorted: List["Family"],
     requests_map: Dict["Family", List["Family"]],
     table_size: int = 10,
-    debug: bool = True,
+    debug: bool = False,
 ) -> Tuple[Dict[int, List[List["Family"]]], List[Tuple["Family", "Family", str]], str]:
     """
     Full seating pipeline.
@@ -381,28 +431,46 @@ def create_area_aware_seating(
         conflicts: List[(Family, Family, str)]
         layout: str
     """
-    print("\n==================== CLUSTERS ====================")
+    debug = debug and log.isEnabledFor(logging.DEBUG)
 
     clusters = build_clusters(families_sorted, requests_map)
-    visualize_clusters(clusters)
+    if debug:
+        visualize_clusters(clusters)
 
     # Keep cluster order consistent with original family order
-    clusters.sort(key=lambda c: families_sorted.index(c[0]))
+    # (first occurrence wins, as with list.index)
+    order: Dict["Family", int] = {}
+    for i, fam in enumerate(families_sorted):
+        order.setdefault(fam, i)
+    clusters.sort(key=lambda c: order[c[0]])
 
-    print("\n==================== AREAS ====================")
-
-    areas: DefaultDict[int, List[List["Family"]]] = defaultdict(list)
-    area_used: Dict[int, int] = defaultdict(int)
+    if debug:
+        log.debug("==================== AREAS ====================")
+
+    areas: Dict[int, List[List["Family"]]] = {}
+    area_used: Dict[int, int] = {}
+    # Per-area seat bookkeeping, indexed by area number (areas are numbered
+    # 0..n-1 in creation order, so plain lists will do): seats used per table,
+    # and family -> table. `location` maps family -> (area, table) overall.
+    tables_used: List[List[int]] = []
+    tables_of: List[Dict["Family", int]] = []
+    location: Dict["Family", Tuple[int, int]] = {}
 
     for cluster in clusters:
+        cluster_size = sum(f.size for f in cluster)
         area_idx = assign_cluster_to_area(
-            cluster, areas, area_used, table_size, debug
+            cluster, areas, area_used, table_size, debug, cluster_size, tables_used
         )
+        if area_idx == len(tables_used):  # new area
+            areas[area_idx] = []
+            area_used[area_idx] = 0
+            tables_used.append([])
+            tables_of.append({})
 
         if debug:
-            print(
-                f"→ Cluster {[f.last_name for f in cluster]} "
-                f"assigned to Area {area_idx}"
+            log.debug(
+                "→ Cluster %s assigned to Area %d",
+                [f.last_name for f in cluster], area_idx,
             )
 
         place_cluster_into_area(
@@ -411,17 +479,22 @@ def create_area_aware_seating(
             table_size,
             requests_map=requests_map,
             debug=debug,
+            table_used=tables_used[area_idx],
+            table_of=tables_of[area_idx],
         )
+        table_of = tables_of[area_idx]
+        for fam in cluster:
+            location[fam] = (area_idx, table_of[fam])
 
-        area_used[area_idx] += sum(f.size for f in cluster)
+        area_used[area_idx] += cluster_size
 
     if debug:
-        print("\n==================== GENERATING CONFLICT REPORT ====================")
+        log.debug("==================== GENERATING CONFLICT REPORT ====================")
 
-    conflicts = generate_conflict_report(areas, requests_map)
+    conflicts = generate_conflict_report(areas, requests_map, location)
 
     if debug:
-        print("\n==================== FINAL LAYOUT ====================")
+        log.debug("==================== FINAL LAYOUT ====================")
 
     layout = visualize_areas(areas)
 
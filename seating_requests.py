@@ -2,9 +2,13 @@
 
 import string
 import re
-from difflib import get_close_matches
+from difflib import SequenceMatcher
+from functools import lru_cache
 from family import Family
 
+_PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
+_POSSESSIVE_RE = re.compile(r"(\w+)(['’]s|s['’])\b")
+
 def extract_families_from_request(
     request_string,
     last_to_firstnames,
@@ -12,20 +16,27 @@ def extract_families_from_request(
     fuzzy_cutoff=0.90,
     use_fuzzy=False,
     debug=False,
+    lower_to_lasts=None,
+    folded_firsts=None,
 ):
     """
     Extracts families mentioned in a request string using:
     1. Last-name matching (exact + optional fuzzy)
     2. First-name disambiguation when multiple families share a last name
     3. Returns all matching families when ambiguity remains
+
+    lower_to_lasts (see lowercase_last_names) and folded_firsts (see
+    casefold_first_names) can be built once by the caller and passed in when
+    extracting from many requests.
     """
+    if not request_string or request_string.isspace():
+        return []
+    if lower_to_lasts is None:
+        lower_to_lasts = lowercase_last_names(last_to_firstnames)
 
-    # Normalize and strip punctuation
     raw = request_string
-    req = request_string.lower()
-    req = strip_possessives(req)
-    req = req.translate(str.maketrans("", "", string.punctuation))
-    tokens = req.split()
+    req, tokens = normalize_request(request_string)
+    token_set = set(tokens)
 
 
     if debug:
@@ -40,28 +51,32 @@ def extract_families_from_request(
     detected_last_names = set()
 
     # Step 1 — detect last names
-    for last in last_to_firstnames.keys():
-        last_lower = last.lower()
-
-        # Exact token match
-        if last_lower in tokens:
-            detected_last_names.add(last)
+    # Exact token match: look each token up instead of scanning every last name
+    lasts_for = lower_to_lasts.get
+    add_last = detected_last_names.add
+    for token in dict.fromkeys(tokens):
+        for last in lasts_for(token, ()):
+            add_last(last)
             if debug:
                 print(f"  Detected last name by token: {last!r}")
-            continue
 
-        # Optional fuzzy match
-        if use_fuzzy:
-            close = get_close_matches(last_lower, tokens, n=1, cutoff=fuzzy_cutoff)
-            if close:
-                detected_last_names.add(last)
+    # Optional fuzzy match, for last names without an exact hit
+    if use_fuzzy:
+        for last_lower, lasts in lower_to_lasts.items():
+            if last_lower in token_set:
+                continue
+            close = best_close_match(last_lower, tokens, fuzzy_cutoff)
+            if close is not None:
+                detected_last_names.update(lasts)
                 if debug:
-                    print(f"  Detected last name by fuzzy match: {last!r} ~ {close[0]!r}")
+                    for last in lasts:
+                        print(f"  Detected last name by fuzzy match: {last!r} ~ {close!r}")
 
     if debug:
         print(f"Detected last names: {detected_last_names}")
 
     # Step 2 — disambiguation logic
+    add_family = matched_families.append
     for last in detected_last_names:
         families = last_to_families[last]
 
@@ -71,35 +86,38 @@ def extract_families_from_request(
             print(f"  Possible first names: {last_to_firstnames[last]}")
 
         if len(families) == 1:
-            matched_families.append(families[0])
+            add_family(families[0])
             continue
 
         possible_firsts = last_to_firstnames[last]
-        found_firsts = [first for first in possible_firsts if first.lower() in tokens]
+        if folded_firsts is not None:
+            folded = folded_firsts[last]
+        else:
+            folded = [first.casefold() for first in possible_firsts]
+        found_firsts = [
+            first for first, folded_first in zip(possible_firsts, folded)
+            if folded_first in token_set
+        ]
 
         if len(found_firsts) == 1:
-            first = found_firsts[0].lower()
+            first = found_firsts[0].casefold()
             for fam in families:
-                if fam.first_name.lower() == first:
-                    matched_families.append(fam)
+                if fam.first_name.casefold() == first:
+                    add_family(fam)
                     break
             continue
 
         if len(found_firsts) > 1:
+            found_firsts_lower = {first.casefold() for first in found_firsts}
             for fam in families:
-                if fam.first_name in found_firsts:
-                    matched_families.append(fam)
+                if fam.first_name.casefold() in found_firsts_lower:
+                    add_family(fam)
             continue
 
         matched_families.extend(families)
 
     # Deduplicate while preserving order
-    seen = set()
-    result = []
-    for fam in matched_families:
-        if fam not in seen:
-            seen.add(fam)
-            result.append(fam)
+    result = list(dict.fromkeys(matched_families))
 
     if debug:
         print(f"\nFinal matched families (deduped): {result}")
@@ -108,9 +126,86 @@ def extract_families_from_request(
     return result
 
 
+def build_requests_map(families, last_to_firstnames, last_to_families) -> dict[Family, list[Family]]:
+    """
+    Map each family to the families its request mentions.
+
+    Most families leave the requests box empty and some requests are repeated
+    word for word, so each distinct request string is parsed once.
+    """
+    lower_to_lasts = lowercase_last_names(last_to_firstnames)
+    folded_firsts = casefold_first_names(last_to_firstnames)
+    extracted: dict[str, list[Family]] = {}
+    requests_map: dict[Family, list[Family]] = {}
+    for family in families:
+        request = family.requests
+        if request not in extracted:
+            extracted[request] = extract_families_from_request(
+                request_string=request,
+                last_to_firstnames=last_to_firstnames,
+                last_to_families=last_to_families,
+                lower_to_lasts=lower_to_lasts,
+                folded_firsts=folded_firsts,
+            )
+        requests_map[family] = extracted[request]
+    return requests_map
+
+
+def lowercase_last_names(last_to_firstnames) -> dict[str, list[str]]:
+    """Map each casefolded last name to the last names (as written) that share it"""
+    lower_to_lasts: dict[str, list[str]] = {}
+    for last in last_to_firstnames:
+        lower_to_lasts.setdefault(last.casefold(), []).append(last)
+    return lower_to_lasts
+
+
+def casefold_first_names(last_to_firstnames) -> dict[str, tuple[str, ...]]:
+    """Casefold each last name's first names once, in last_to_firstnames order"""
+    return {
+        last: tuple(first.casefold() for first in firsts)
+        for last, firsts in last_to_firstnames.items()
+    }
+
+
+def best_close_match(word: str, candidates, cutoff: float):
+    """
+    Same answer as difflib.get_close_matches(word, candidates, n=1, cutoff)[0]
+    (or None), but reuses one SequenceMatcher per word across calls so the
+    word's lookup tables are built once rather than on every request.
+    """
+    matcher = _matcher_for(word)
+    best = None
+    for candidate in candidates:
+        matcher.set_seq1(candidate)
+        if (matcher.real_quick_ratio() >= cutoff
+                and matcher.quick_ratio() >= cutoff):
+            score = matcher.ratio()
+            if score >= cutoff and (best is None or (score, candidate) > best):
+                best = (score, candidate)
+    return best[1] if best else None
+
+
+@lru_cache(maxsize=4096)
+def _matcher_for(word: str) -> SequenceMatcher:
+    matcher = SequenceMatcher()
+    matcher.set_seq2(word)
+    return matcher
+
+
+def normalize_request(request_string: str) -> tuple[str, tuple[str, ...]]:
+    """Casefold, strip possessives and punctuation; return (normalized, tokens)"""
+    req = request_string.casefold()
+    req = strip_possessives(req)
+    req = req.translate(_PUNCTUATION_TABLE)
+    return req, tuple(req.split())
+
+
 def strip_possessives(text: str) -> str:
     # Handles: Smith's, Adams’, Jones’s, Williams’
-    return re.sub(r"(\w+)(['’]s|s['’])\b", r"\1", text)
+    # Most requests have no apostrophe at all; skip the regex for those
+    if "'" not in text and "’" not in text:
+        return text
+    return _POSSESSIVE_RE.sub(r"\1", text)
 
 def print_requests_map(requests_map: dict["Family", list["Family"]]) -> None:
     """
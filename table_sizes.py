@@ -2,10 +2,19 @@ import yaml
 from pathlib import Path
 from collections import defaultdict
 
-def get_table_sizes(yaml_path: Path):
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+
+def load_seating_yaml(yaml_path: Path) -> dict:
+    """Parse an areas file once so the functions below can share it"""
     with open(yaml_path, "r") as f:
-        data = yaml.safe_load(f)
+        return yaml.load(f, Loader=SafeLoader)
 
+
+def get_table_sizes(data: dict):
     sizes = defaultdict(list)
     for tables in data.values():
         for table, families in tables.items():
@@ -18,31 +27,22 @@ def write_table_sizes(sizes: dict, output_path: Path, num_guests: int, num_famil
     """
     Write a map of table sizes to tables
     """
+    lines = [f"Guests: {num_guests}\n", f"Families: {num_families}\n"]
+    for size in sorted(sizes.keys()):
+        lines.append(f"{size}:\n")
+        lines.extend(f"  {table}\n" for table in sizes[size])
     with open(output_path, 'w') as f:
-        f.write(f"Guests: {num_guests}\n")
-        f.write(f"Families: {num_families}\n")
-        for size in sorted(sizes.keys()):
-            f.write(f"{size}:\n")
-            for table in sizes[size]:
-                f.write(f"  {table}\n")
+        f.write("".join(lines))
 
 
-def get_num_guests(yaml_path: Path):
-    with open(yaml_path, "r") as f:
-        data = yaml.safe_load(f)
-    num_guests = 0
-    for tables in data.values():
-        for families in tables.values():
-            table_size = sum(fam_yaml['size'] for fam_yaml in families)
-            num_guests += table_size
-    return num_guests
-        
+def get_num_guests(data: dict):
+    return sum(
+        fam_yaml['size']
+        for tables in data.values()
+        for families in tables.values()
+        for fam_yaml in families
+    )
 
-def get_num_families(yaml_path: Path):
-    with open(yaml_path, "r") as f:
-        data = yaml.safe_load(f)
-    num_families = 0
-    for tables in data.values():
-        num_families += len(tables.values())
-    return num_families
 
+def get_num_families(data: dict):
+    return sum(len(tables) for tables in data.values())
@@ -1,3 +1,6 @@
+import os
+import subprocess
+import sys
 from datetime import datetime
 import pytest
 from family import Family
@@ -39,6 +42,12 @@ def test_payment_from_csv():
     payments = Payment.from_csv(payment_path)
     assert len(payments) >= 120
 
+def test_payment_from_csv_skips_blank_lines(tmp_path):
+    padded = tmp_path / "payment.csv"
+    text = payment_path.read_text(encoding="utf-16")
+    padded.write_text(text + "\n\n", encoding="utf-16")
+    assert Payment.from_csv(padded) == Payment.from_csv(payment_path)
+
 @pytest.fixture
 def sample_data():
     payments = {
@@ -104,10 +113,84 @@ def test_get_matched_payments(sample_data):
 
 def test_match_families_with_payment(sample_data):
     payments, families = sample_data
-    matched_families, get_matched_payments_set = match_families_with_payments(families=families, payments=payments)
+    matched_families, get_matched_payments_set, unmatched_families, unmatched_payments = match_families_with_payments(families=families, payments=payments)
     assert any(f.email == "alice@example.com" for f in matched_families)
     assert any(p.email == "alice@example.com" for p in get_matched_payments_set)
     # Ensure unmatched families are excluded
     assert all(f.email != "eve@example.com" for f in matched_families)
     assert all(f.email != "charlie@example.com" for f in matched_families)
+    # Unmatched sets are the complements
+    assert {f.email for f in unmatched_families} == {"eve@example.com"}
+    assert {p.email for p in unmatched_payments} == {"charlie@example.com"}
+    assert matched_families | unmatched_families == families
+    assert get_matched_payments_set | unmatched_payments == payments
 
+def test_match_families_with_payment_either_side_smaller(sample_data):
+    payments, families = sample_data
+    expected = match_families_with_payments(families=families, payments=payments)
+    # drop the unmatched payment so payments is the smaller side
+    fewer_payments = {p for p in payments if p.email != "charlie@example.com"}
+    matched_families, matched_payments, unmatched_families, unmatched_payments = match_families_with_payments(families=families, payments=fewer_payments)
+    assert matched_families == expected[0]
+    assert matched_payments == expected[1]
+    assert unmatched_families == expected[2]
+    assert unmatched_payments == set()
+
+
+
+def test_invitation_address_fast_path_matches_usaddress():
+    from family import Guest, Meal
+    from invitation import Invitation, _SIMPLE_ADDRESS_RE
+    addresses = [
+        "10958 Mount Evans Dr Peyton, CO 80831 US",
+        "4736 Stormy Peaks Ct. Colorado Springs, CO 80918 US",
+        "1764 Cinnamon Rd Larkspur , CO 80118 US",
+        "2423 N Tejon St Colorado Springs, CO 80907 US",  # directional -> usaddress
+    ]
+    assert _SIMPLE_ADDRESS_RE.match(addresses[0])
+    assert not _SIMPLE_ADDRESS_RE.match(addresses[-1])
+    families = [
+        Family(f"{i}@example.com", "", address, "", datetime.now(),
+               guests=[Guest("John", "Smith", Meal.Chicken, "", 40)])
+        for i, address in enumerate(addresses)
+    ]
+    invitations = Invitation.from_families(families)
+    assert [(inv.address1, inv.address2) for inv in invitations] == [
+        ("10958 Mount Evans Dr", "Peyton, CO 80831"),
+        ("4736 Stormy Peaks Ct.", "Colorado Springs, CO 80918"),
+        ("1764 Cinnamon Rd", "Larkspur, CO 80118"),
+        ("2423 Tejon St", "Colorado Springs, CO 80907"),
+    ]
+
+
+def test_cached_hashes_survive_pickle_across_processes(tmp_path):
+    # The match cache pickles Families and Payments in one process and loads
+    # them in another, where string hashes differ
+    pickled = tmp_path / "matched.pkl"
+    dump = (
+        "import pickle, sys\n"
+        "from datetime import datetime\n"
+        "from family import Family\n"
+        "from payment import Payment\n"
+        "fam = Family('a@example.com', '', '', '', datetime(2024, 1, 1), part=1)\n"
+        "pay = Payment('Smith', 'Alice', 'a@example.com', '', '42')\n"
+        "pickle.dump((frozenset([fam]), frozenset([pay])), open(sys.argv[1], 'wb'))\n"
+    )
+    load = (
+        "import pickle, sys\n"
+        "from datetime import datetime\n"
+        "from family import Family\n"
+        "from payment import Payment\n"
+        "families, payments = pickle.load(open(sys.argv[1], 'rb'))\n"
+        "fam = Family('a@example.com', '', '', '', datetime(2024, 1, 1), part=1)\n"
+        "pay = Payment('Smith', 'Alice', 'a@example.com', '', '42')\n"
+        "assert fam in families and {next(iter(families)): 1}.get(fam) == 1\n"
+        "assert pay in payments and {next(iter(payments)): 1}.get(pay) == 1\n"
+    )
+    for seed, script in (("1", dump), ("2", load)):
+        subprocess.run(
+            [sys.executable, "-c", script, str(pickled)],
+            cwd=package_root,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            check=True,
+        )
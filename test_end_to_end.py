@@ -2,10 +2,11 @@ import pytest
 from io import StringIO
 from pathlib import Path
 from datetime import datetime
+from operator import attrgetter
 import yaml
 
 from family import Family, Guest, Meal
-from seating_requests import extract_families_from_request
+from seating_requests import build_requests_map
 from seating_chart import create_area_aware_seating
 from write_seating_results import write_seating_results
 from helpers_for_testing import make_family
@@ -31,21 +32,14 @@ def test_end_to_end_pipeline(tmp_path):
     unique_families = Family.unique(families)
 
     # Sort
-    sorted_families = sorted(unique_families, key=lambda f: f.submission)
+    sorted_families = sorted(unique_families, key=attrgetter('submission'))
 
     # Build lookup maps
     last_to_first = Family.last_to_firstnames(sorted_families)
     last_to_family = Family.last_to_family(sorted_families)
 
     # Build request map
-    request_map = {}
-    for fam in sorted_families:
-        reqs = extract_families_from_request(
-            request_string=fam.requests,
-            last_to_firstnames=last_to_first,
-            last_to_families=last_to_family,
-        )
-        request_map[fam] = reqs
+    request_map = build_requests_map(sorted_families, last_to_first, last_to_family)
 
     # Run seating engine
     areas, conflicts, layout = create_area_aware_seating(
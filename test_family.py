@@ -14,37 +14,40 @@ def make_family(email, phone='', address='', part=0):
         guests=[Guest("Test", "User", Meal.Chicken, "", 30)]
     )
 
-def test_unique_families_removes_duplicates_by_phone():
-    fam1 = make_family("a@example.com", "123", "Addr1")
-    fam2 = make_family("b@example.com", "123", "Addr2")  # duplicate phone
-    families = {fam1, fam2}
+@pytest.mark.parametrize("phones, addresses, expected_len", [
+    (["123", "123"], ["Addr1", "Addr2"], 1),    # duplicate phone
+    (["111", "222"], ["SameAddr", "SameAddr"], 1),  # duplicate address
+    (["111", "222"], ["Addr1", "Addr2"], 2),    # all unique
+    ([], [], 0),                                # empty set
+])
+def test_unique_families(phones, addresses, expected_len):
+    families = {
+        make_family(f"{i}@example.com", phone, address)
+        for i, (phone, address) in enumerate(zip(phones, addresses))
+    }
 
     unique = Family.unique(families)
-    assert len(unique) == 1
-    assert any(f.phone == "123" for f in unique)
+    assert len(unique) == expected_len
+    assert unique <= families
+    # no two kept families share a (non-blank) phone or address
+    kept_phones = [f.phone for f in unique if f.phone]
+    kept_addresses = [f.address for f in unique if f.address]
+    assert len(kept_phones) == len(set(kept_phones))
+    assert len(kept_addresses) == len(set(kept_addresses))
+
+def test_last_name_indexes_match_separate_helpers():
+    smith1 = Family("a@example.com", "", "", "", datetime.now(), guests=[Guest("John", "Smith", Meal.Chicken, "", 40)])
+    smith2 = Family("b@example.com", "", "", "", datetime.now(), guests=[Guest("Paul", "Smith", Meal.Chicken, "", 40)])
+    jones = Family("c@example.com", "", "", "", datetime.now(), guests=[Guest("Ava", "Jones", Meal.Chicken, "", 40)])
+    families = [smith1, smith2, jones]
+
+    last_to_first, last_to_family = Family.last_name_indexes(families)
+
+    assert last_to_first == Family.last_to_firstnames(families)
+    assert last_to_family == Family.last_to_family(families)
+    assert last_to_family["Smith"] == [smith1, smith2]
+    assert list(last_to_family) == ["Jones", "Smith"]
 
-def test_unique_families_removes_duplicates_by_address():
-    fam1 = make_family("a@example.com", "111", "SameAddr")
-    fam2 = make_family("b@example.com", "222", "SameAddr")  # duplicate address
-    families = {fam1, fam2}
-
-    unique = Family.unique(families)
-    assert len(unique) == 1
-    assert any(f.address == "SameAddr" for f in unique)
-
-def test_unique_families_keeps_unique_entries():
-    fam1 = make_family("a@example.com", "111", "Addr1")
-    fam2 = make_family("b@example.com", "222", "Addr2")
-    families = {fam1, fam2}
-
-    unique = Family.unique(families)
-    assert len(unique) == 2
-    assert fam1 in unique and fam2 in unique
-
-def test_unique_families_empty_set():
-    families = set()
-    unique = Family.unique(families)
-    assert unique == set()
 import pytest
 from family import Family, Guest, Meal
 from datetime import datetime
@@ -153,3 +156,19 @@ def test_repr_includes_part_only_when_nonzero():
 
     assert "part=1" in repr(f1)
     assert "part=" not in repr(f0)
+
+def test_from_csv_skips_blank_lines(tmp_path):
+    guest_list = tmp_path / "guest-list.csv"
+    guest_list.write_text(
+        "Submission time,Email,Phone,Mailing Address,Tickets,"
+        "First Name (Ticket 1),Last Name (Ticket 1),Age (Ticket 1),"
+        "Meal Choice (Ticket 1),List Allergies (Ticket 1):\n"
+        "2024-01-01 10:00:00,a@example.com,,1 Main St,1,John,Smith,40,Beef,\n"
+        "\n"
+        "2024-01-02 10:00:00,b@example.com,,2 Main St,1,Ava,Jones,,,\n"
+        "\n",
+        encoding="utf-8",
+    )
+
+    families = Family.from_csv(guest_list)
+    assert {f.email for f in families} == {"a@example.com", "b@example.com"}
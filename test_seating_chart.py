@@ -1,4 +1,5 @@
 import pytest
+from itertools import chain
 from typing import Dict, List
 
 from seating_chart import (
@@ -6,6 +7,7 @@ from seating_chart import (
     assign_cluster_to_area,
     place_cluster_into_area,
     generate_conflict_report,
+    iter_conflicts,
     create_area_aware_seating,
     split_oversized_families
 )
@@ -15,8 +17,10 @@ from family import Family
 # ---------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------
+# Module-scoped: tests only read these families and request maps, placing
+# them into tables and areas they build themselves
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def simple_families():
     """
     Test fixture:
@@ -37,7 +41,7 @@ def simple_families():
     families = [smith1, smith2, jones]
     return families, request_map, smith1, smith2, jones
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def complex_families():
     """
     Test fixture:
@@ -296,6 +300,21 @@ def test_cluster_fits_in_no_existing_area():
     assert idx == 2  # new area
 
 
+def test_cluster_goes_to_tightest_fitting_area():
+    areas = {
+        0: [[make_family("A", "Alpha", 3)]],  # 7 seats left
+        1: [[make_family("B", "Beta", 6)]],   # 4 seats left
+        2: [[make_family("C", "Gamma", 8)]],  # 2 seats left, too few
+    }
+    area_used = {0: 3, 1: 6, 2: 8}
+
+    cluster = [make_family("D", "Delta", 3)]
+
+    idx = assign_cluster_to_area(cluster, areas, area_used, table_size=10, debug=False)
+
+    assert idx == 1  # best fit
+
+
 # ---------------------------------------------------------
 # 3. Test table placement
 # ---------------------------------------------------------
@@ -318,6 +337,17 @@ def test_place_cluster_into_area(simple_families):
     assert area_tables[0] == [smith1, jones]
 
 
+def test_place_cluster_largest_families_first():
+    # in arrival order the 3s fill table 0 and the 7 and 4 each need a table;
+    # largest-first packs 7+3 and 4+3+3
+    cluster = [make_family(name, name, size) for name, size in
+               [("A", 3), ("B", 3), ("C", 3), ("D", 7), ("E", 4)]]
+
+    area_tables: List[List[Family]] = []
+    place_cluster_into_area(cluster, area_tables, table_size=10, requests_map={}, debug=False)
+
+    assert [[f.size for f in table] for table in area_tables] == [[7, 3], [4, 3, 3]]
+
 def test_place_cluster_creates_new_table(simple_families):
     """
     When a table cannot fit the next family, a new table should be created.
@@ -361,6 +391,19 @@ def test_conflict_report(simple_families):
     assert reason == "Not seated in same area"
 
 
+def test_iter_conflicts_streams_report(simple_families):
+    families, request_map, smith1, smith2, jones = simple_families
+
+    areas = {
+        0: [[smith1]],
+        1: [[jones]],
+    }
+
+    conflicts = iter_conflicts(areas, request_map)
+    assert next(conflicts) == (smith1, jones, "Not seated in same area")
+    assert next(conflicts, None) is None
+
+
 # ---------------------------------------------------------
 # 5. Test full pipeline
 # ---------------------------------------------------------
@@ -381,14 +424,13 @@ def test_full_pipeline(simple_families):
         debug=False,
     )
 
+    area_of = {f: a for a, tables in areas.items() for t in tables for f in t}
+
     # smith1 and jones should be in same area
-    smith_area = next(a for a, tables in areas.items() if smith1 in sum(tables, []))
-    jones_area = next(a for a, tables in areas.items() if jones in sum(tables, []))
-    assert smith_area == jones_area
+    assert area_of[smith1] == area_of[jones]
 
     # smith2 should also fit into area 0
-    smith2_area = next(a for a, tables in areas.items() if smith2 in sum(tables, []))
-    assert smith2_area == smith_area
+    assert area_of[smith2] == area_of[smith1]
 
     assert conflicts == []
     assert "Smith" in layout
@@ -465,7 +507,7 @@ def test_requested_families_affect_table_choice():
     assert a in area_tables[0]
 
     # c can go anywhere
-    assert c in sum(area_tables, [])
+    assert any(c in t for t in area_tables)
 
 def test_clusters_can_share_tables_when_space_allows():
     """
@@ -506,7 +548,7 @@ def test_clusters_can_share_tables_when_space_allows():
     tables = list(areas.values())[0]
 
     # Flatten tables
-    seated = sum(tables, [])
+    seated = list(chain.from_iterable(tables))
 
     # All three families should be at the same table
     assert smith in tables[0]
@@ -1,6 +1,6 @@
 import pytest
 
-from seating_requests import extract_families_from_request
+from seating_requests import build_requests_map, extract_families_from_request
 from family import Family, Guest, Meal
 from datetime import datetime
 
@@ -224,3 +224,34 @@ def test_plural_last_name_not_stripped():
     )
     assert result == [jones]
 
+
+def test_casefolded_last_name_matches():
+    strauss = make_family("Anna", "Strauß")
+
+    last_to_first = {"Strauß": ["Anna"]}
+    last_to_families = {"Strauß": [strauss]}
+
+    req = "PLEASE SEAT US WITH THE STRAUSS FAMILY"
+
+    result = extract_families_from_request(req, last_to_first, last_to_families)
+    assert result == [strauss]
+
+
+def test_build_requests_map_parses_repeated_requests_once(sample_data):
+    last_to_firstnames, last_to_families, smith1, smith2, jones = sample_data
+    smith1.requests = "Please seat us with Ava Jones"
+    smith2.requests = "Please seat us with Ava Jones"
+
+    requests_map = build_requests_map([smith1, smith2, jones], last_to_firstnames, last_to_families)
+
+    assert requests_map == {smith1: [jones], smith2: [jones], jones: []}
+    assert requests_map[smith1] is requests_map[smith2]
+
+
+def test_build_requests_map_disambiguates_first_names(sample_data):
+    last_to_firstnames, last_to_families, smith1, smith2, jones = sample_data
+    jones.requests = "Near PAUL smith please"
+
+    requests_map = build_requests_map([smith1, smith2, jones], last_to_firstnames, last_to_families)
+
+    assert requests_map[jones] == [smith2]
@@ -1,6 +1,12 @@
 import yaml
+from itertools import count
 from pathlib import Path
 
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper
+
 def write_seating_results(areas, conflicts, layout, areas_path: Path, conflicts_path: Path):
     print("\n==================== SEATING LAYOUT ====================")
     print(layout)
@@ -9,20 +15,15 @@ def write_seating_results(areas, conflicts, layout, areas_path: Path, conflicts_
     # ----------------------------------------------------
     # 1. Build nested structure: areas → global tables
     # ----------------------------------------------------
-    areas_serializable = {}
-    global_table_id = 0
-
-    for area_idx in sorted(areas.keys()):
-        tables = areas[area_idx]
-
-        # Each area becomes a dict of table_id → families
-        area_map = {}
-
-        for table in tables:
-            area_map[global_table_id] = [fam.to_dict() for fam in table]
-            global_table_id += 1
-
-        areas_serializable[area_idx] = area_map
+    # Table ids run across areas, so each table has a unique id
+    table_ids = count()
+    areas_serializable = {
+        area_idx: {
+            next(table_ids): [fam.to_dict() for fam in table]
+            for table in areas[area_idx]
+        }
+        for area_idx in sorted(areas)
+    }
 
     # ----------------------------------------------------
     # 2. Convert conflicts to serializable form
@@ -40,7 +41,7 @@ def write_seating_results(areas, conflicts, layout, areas_path: Path, conflicts_
     # 3. Write YAML files
     # ----------------------------------------------------
     with open(areas_path, "w") as f:
-        yaml.dump(areas_serializable, f, sort_keys=True)
+        yaml.dump(areas_serializable, f, Dumper=SafeDumper, sort_keys=True)
 
     with open(conflicts_path, "w") as f:
-        yaml.dump(conflicts_serializable, f, sort_keys=False)
+        yaml.dump(conflicts_serializable, f, Dumper=SafeDumper, sort_keys=False)